@@ -4,67 +4,169 @@ Combine all individual markdown files in the notebook directory into a single fi
 """
 
 import os
+import re
+import sys
+import shutil
+import argparse
+import subprocess
 from pathlib import Path
 from collections import defaultdict
 
+# Read notes in large blocks: fewer read() syscalls than the 8 KB default
+READ_BUFFER_SIZE = 128 * 1024
+
+# PDF engines pandoc can drive, and how to install each
+PDF_ENGINE_INSTALL = {
+    "xelatex": "sudo apt install texlive-xetex",
+    "weasyprint": "sudo apt install weasyprint",
+    "typst": "see https://github.com/typst/typst#installation",
+}
+
+# First pandoc release that accepts --pdf-engine=typst
+PANDOC_TYPST_VERSION = (3, 1, 2)
+
 def get_section_title(directory_name):
     """Convert directory name to a readable section title."""
     return directory_name.replace('-', ' ').title()
 
+def collect_files(notebook_dir):
+    """Group markdown files by their directory, relative to the notebook root."""
+    files_by_dir = defaultdict(list)
+
+    # Walk with os.scandir: DirEntry caches the file type from the directory
+    # read, so no extra stat() is needed per entry
+    pending = [notebook_dir]
+    while pending:
+        current = pending.pop()
+        rel_dir = os.path.relpath(current, notebook_dir)
+        parent_dir = 'root' if rel_dir == '.' else rel_dir
+
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.endswith('.md') and entry.is_file():
+                    # Skip the combined output file if it exists
+                    if entry.name == 'combined-notebook.md':
+                        continue
+                    files_by_dir[parent_dir].append(Path(entry.path))
+
+    return files_by_dir
+
+def write_note(outf, md_file):
+    """Write one note under a level-2 heading.
+
+    A note starts with its own H1 title; it is demoted to be the note's
+    heading, so it doesn't sit at the level of the section headings. Notes
+    without one get a heading derived from the file name.
+    """
+    with open(md_file, 'r', encoding='utf-8', buffering=READ_BUFFER_SIZE) as inf:
+        first = inf.readline()
+        if first.startswith('# '):
+            outf.write(f"#{first}\n")
+        else:
+            file_title = md_file.stem.replace('-', ' ').title()
+            outf.write(f"## {file_title}\n\n")
+            outf.write(first)
+
+        # Stream the rest of the note unchanged
+        shutil.copyfileobj(inf, outf, READ_BUFFER_SIZE)
+    outf.write("\n\n")
+
+def write_combined(outf, files_by_dir):
+    """Write the combined notebook to any text stream (file, pipe, ...)."""
+    outf.write("# STT Fine-Tuning Notebook - Complete Reference\n\n")
+    outf.write("This document combines all individual notes from the STT Fine-Tuning Notebook.\n\n")
+    outf.write("---\n\n")
+
+    # Process each directory
+    for dir_path in sorted(files_by_dir.keys()):
+        if dir_path == 'root':
+            section_title = "General Notes"
+        else:
+            # Use the last part of the path for section title
+            section_name = Path(dir_path).name
+            section_title = get_section_title(section_name)
+
+        outf.write(f"# {section_title}\n\n")
+
+        # Process each file in this directory
+        for md_file in sorted(files_by_dir[dir_path]):
+            write_note(outf, md_file)
+            outf.write("---\n\n")
+
+def pandoc_version():
+    """Return pandoc's version as a tuple of ints, or None if it can't be run."""
+    try:
+        result = subprocess.run(["pandoc", "--version"], capture_output=True, text=True, check=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+    # First line looks like "pandoc 3.1.11"
+    match = re.match(r'\S+\s+(\d+(?:\.\d+)*)', result.stdout)
+    return tuple(int(part) for part in match.group(1).split('.')) if match else None
+
+def default_pdf_engine():
+    """Prefer Typst (single-pass, much faster than LaTeX) when pandoc can use it."""
+    if shutil.which("typst"):
+        version = pandoc_version()
+        if version is not None and version >= PANDOC_TYPST_VERSION:
+            return "typst"
+    return "xelatex"
+
+def render_pdf(files_by_dir, pdf_file, engine="xelatex"):
+    """Pipe the combined notebook straight into pandoc to build a PDF."""
+    # pandoc converts to the engine's input format (LaTeX, HTML or Typst) itself
+    cmd = ["pandoc", "-f", "markdown", "-o", str(pdf_file), f"--pdf-engine={engine}"]
+
+    try:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, text=True, encoding='utf-8')
+    except FileNotFoundError:
+        print("Error: pandoc not found. Install it to build the PDF:")
+        print("  sudo apt install pandoc")
+        print(f"  PDF engine ({engine}): {PDF_ENGINE_INSTALL[engine]}")
+        sys.exit(1)
+
+    try:
+        try:
+            write_combined(proc.stdin, files_by_dir)
+        finally:
+            proc.stdin.close()
+    except BrokenPipeError:
+        pass  # pandoc quit without reading everything; its exit status says why
+
+    if proc.wait() != 0:
+        print(f"Error: pandoc exited with status {proc.returncode}")
+        sys.exit(1)
+
 def main():
+    parser = argparse.ArgumentParser(description="Combine the notebook into a single document")
+    parser.add_argument("--pdf", nargs="?", const="STT-Fine-Tuning-Guide.pdf", metavar="PATH",
+                        help="Build a PDF with pandoc (default path: STT-Fine-Tuning-Guide.pdf)")
+    parser.add_argument("--emit-markdown", action="store_true",
+                        help="Also write combined-notebook.md when building a PDF")
+    parser.add_argument("--engine", choices=sorted(PDF_ENGINE_INSTALL),
+                        help="PDF engine for pandoc (default: typst if installed and pandoc >= 3.1.2, else xelatex)")
+
+    args = parser.parse_args()
+
     # Get the notebook directory
     script_dir = Path(__file__).parent
     notebook_dir = script_dir.parent / 'notebook'
     output_file = notebook_dir / 'combined-notebook.md'
 
     # Organize files by directory
-    files_by_dir = defaultdict(list)
+    files_by_dir = collect_files(notebook_dir)
+    print(f"Combined {sum(len(files) for files in files_by_dir.values())} files")
 
-    # Find all markdown files
-    for md_file in sorted(notebook_dir.rglob('*.md')):
-        # Skip the combined output file if it exists
-        if md_file.name == 'combined-notebook.md':
-            continue
-
-        # Get relative path from notebook dir
-        rel_path = md_file.relative_to(notebook_dir)
-        parent_dir = str(rel_path.parent) if rel_path.parent != Path('.') else 'root'
-
-        files_by_dir[parent_dir].append(md_file)
-
-    # Write combined file
-    with open(output_file, 'w', encoding='utf-8') as outf:
-        outf.write("# STT Fine-Tuning Notebook - Complete Reference\n\n")
-        outf.write("This document combines all individual notes from the STT Fine-Tuning Notebook.\n\n")
-        outf.write("---\n\n")
-
-        # Process each directory
-        for dir_path in sorted(files_by_dir.keys()):
-            if dir_path == 'root':
-                section_title = "General Notes"
-            else:
-                # Use the last part of the path for section title
-                section_name = Path(dir_path).name
-                section_title = get_section_title(section_name)
-
-            outf.write(f"# {section_title}\n\n")
-
-            # Process each file in this directory
-            for md_file in sorted(files_by_dir[dir_path]):
-                # Write file header
-                file_title = md_file.stem.replace('-', ' ').title()
-                outf.write(f"## {file_title}\n\n")
-
-                # Write file contents
-                with open(md_file, 'r', encoding='utf-8') as inf:
-                    content = inf.read()
-                    outf.write(content)
-                    outf.write("\n\n")
-
-                outf.write("---\n\n")
+    # Write combined file (skipped for PDF builds unless asked for)
+    if not args.pdf or args.emit_markdown:
+        with open(output_file, 'w', encoding='utf-8') as outf:
+            write_combined(outf, files_by_dir)
+        print(f"Output written to: {output_file}")
 
-    print(f"Combined {sum(len(files) for files in files_by_dir.values())} files")
-    print(f"Output written to: {output_file}")
+    if args.pdf:
+        render_pdf(files_by_dir, Path(args.pdf), engine=args.engine or default_pdf_engine())
+        print(f"PDF written to: {args.pdf}")
 
 if __name__ == '__main__':
     main()
@@ -7,9 +7,22 @@ to podcast-ready SSML format.
 
 import os
 import sys
+import glob
 from pathlib import Path
 import json
+try:
+    import orjson  # Optional: much faster manifest serialization
+except ImportError:
+    orjson = None
+import re
+import hashlib
+import functools
+import tempfile
+from collections import Counter
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 # Configuration
@@ -21,11 +34,46 @@ if not OPENROUTER_API_KEY:
 OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 MODEL = "openai/gpt-4o-mini"  # Affordable, high-quality model for SSML conversion
 
+# One pooled, keep-alive session for every API call, so the TLS handshake is
+# paid once per connection rather than once per file. Rate limits (429) and
+# transient server errors are retried with exponential backoff.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["POST"]
+    )
+))
+
 NOTEBOOK_DIR = Path(__file__).parent.parent / "notebook"
 OUTPUT_DIR = Path(__file__).parent.parent / "podcast-ssml"
 
-# SSML conversion prompt
-SSML_CONVERSION_PROMPT = """You are a podcast script writer. Convert the following markdown technical content into SSML (Speech Synthesis Markup Language) format suitable for text-to-speech synthesis.
+# LLM responses keyed by a hash of model + prompt + content, so identical
+# content (shared boilerplate, unchanged chunks) is never paid for twice
+CACHE_DIR = Path(__file__).parent / ".ssml-cache"
+
+# Conversions are network-bound, so several can be in flight at once
+DEFAULT_WORKERS = 8
+
+# Limits for sanitize_markdown(): runaway pastes cost tokens and time out
+MAX_PARAGRAPH_CHARS = 15000
+MAX_PARAGRAPH_REPEATS = 100
+
+# Long notes are split into chunks of at most this many tokens, converted
+# concurrently (up to CHUNK_WORKERS at a time) and stitched back together
+MAX_CHUNK_TOKENS = 3000
+CHUNK_WORKERS = 4
+
+# tiktoken gives exact counts; without it fall back to ~4 characters per token
+TOKEN_ENCODING_NAME = "o200k_base"
+
+# SSML conversion prompt. Sent as the system message so the identical prefix
+# can be prompt-cached across every request; the content is the user message.
+SSML_CONVERSION_PROMPT = """You are a podcast script writer. Convert the markdown technical content you are given into SSML (Speech Synthesis Markup Language) format suitable for text-to-speech synthesis.
 
 Guidelines:
 1. Use proper SSML tags for natural speech:
@@ -41,22 +89,116 @@ Guidelines:
 7. Maintain technical accuracy while making it accessible
 8. The output should be wrapped in <speak> tags
 
-Here's the content to convert:
-
-{content}
+Long documents are sent in parts, labelled like "(Part 2 of 3)". For a part, only add an intro if it is the first part and only add an outro if it is the last; otherwise continue straight on from the previous part.
 
 Output only the SSML, nothing else."""
 
 
+def dump_manifest(manifest, path):
+    """Write a manifest as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+
 def read_markdown_file(filepath):
     """Read markdown file content."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return f.read()
+    return Path(filepath).read_text(encoding='utf-8')
 
 
-def convert_to_ssml(content, filename):
-    """Convert markdown content to SSML using OpenRouter."""
-    print(f"Converting {filename} to SSML...")
+def sanitize_markdown(content):
+    """Drop content that would only waste tokens before it is sent to the LLM."""
+    # Embedded base64 images
+    content = re.sub(r'!\[[^\]]*\]\(data:[^)]+\)', '', content)
+
+    paragraphs = content.split('\n\n')
+    counts = Counter(paragraphs)
+
+    kept = []
+    seen = set()
+    for paragraph in paragraphs:
+        # Oversized paragraphs (accidental mass pastes)
+        if len(paragraph) > MAX_PARAGRAPH_CHARS:
+            continue
+        # Paragraphs repeated many times over: keep the first copy only
+        if counts[paragraph] > MAX_PARAGRAPH_REPEATS:
+            if paragraph in seen:
+                continue
+            seen.add(paragraph)
+        kept.append(paragraph)
+
+    # Collapse runs of blank lines left behind
+    return re.sub(r'\n{3,}', '\n\n', '\n\n'.join(kept))
+
+
+@functools.lru_cache(maxsize=None)
+def token_encoding():
+    """Load the tiktoken encoding on first use, or return None if unavailable.
+
+    tiktoken downloads the encoding the first time, which can fail offline or
+    behind a proxy; token counts are then estimated instead.
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKEN_ENCODING_NAME)
+    except Exception:
+        return None
+
+
+def count_tokens(text):
+    """Count (or estimate, without tiktoken) the tokens in text."""
+    encoding = token_encoding()
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text))
+
+
+def split_into_chunks(content, max_tokens=MAX_CHUNK_TOKENS):
+    """Split content at paragraph boundaries into chunks of at most max_tokens."""
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for paragraph in content.split('\n\n'):
+        tokens = count_tokens(paragraph)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append('\n\n'.join(current))
+            current = []
+            current_tokens = 0
+        current.append(paragraph)
+        current_tokens += tokens
+
+    if current:
+        chunks.append('\n\n'.join(current))
+
+    return chunks
+
+
+def speak_body(ssml_content):
+    """Return what is inside the outer <speak> element (or everything, if none)."""
+    start = re.search(r'<speak[^>]*>', ssml_content)
+    end = ssml_content.rfind('</speak>')
+    if not start or end < start.end():
+        return ssml_content.strip()
+    return ssml_content[start.end():end].strip()
+
+
+def cache_key(content):
+    """Hash identifying a response: changes with the model, prompt or content."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (MODEL, SSML_CONVERSION_PROMPT, content):
+        h.update(part.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def request_ssml(content, use_cache=True):
+    """Send one piece of content to OpenRouter and return the SSML it produced."""
+    cached_file = CACHE_DIR / f"{cache_key(content)}.ssml"
+    if use_cache and cached_file.exists():
+        return cached_file.read_text(encoding='utf-8')
 
     headers = {
         "Authorization": f"Bearer {OPENROUTER_API_KEY}",
@@ -68,34 +210,111 @@ def convert_to_ssml(content, filename):
     payload = {
         "model": MODEL,
         "messages": [
+            {
+                "role": "system",
+                "content": SSML_CONVERSION_PROMPT
+            },
             {
                 "role": "user",
-                "content": SSML_CONVERSION_PROMPT.format(content=content)
+                "content": content
             }
         ]
     }
 
-    try:
-        response = requests.post(OPENROUTER_URL, headers=headers, json=payload, timeout=120)
-        response.raise_for_status()
+    response = SESSION.post(OPENROUTER_URL, headers=headers, json=payload, timeout=120)
+    response.raise_for_status()
+
+    result = response.json()
+    ssml_content = result['choices'][0]['message']['content']
 
-        result = response.json()
-        ssml_content = result['choices'][0]['message']['content']
+    # Unique temp name: two threads may be converting the same content
+    CACHE_DIR.mkdir(exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(ssml_content)
+    os.replace(tmp_path, cached_file)
 
-        return ssml_content
+    return ssml_content
+
+
+def convert_to_ssml(content, filename, use_cache=True):
+    """Convert markdown content to SSML using OpenRouter."""
+    chunks = split_into_chunks(content)
+    print(f"Converting {filename} to SSML ({len(chunks)} part(s))...")
+
+    try:
+        if len(chunks) == 1:
+            return request_ssml(chunks[0], use_cache)
+
+        labelled = [
+            f"(Part {i} of {len(chunks)})\n\n{chunk}"
+            for i, chunk in enumerate(chunks, 1)
+        ]
+        with ThreadPoolExecutor(max_workers=min(len(chunks), CHUNK_WORKERS)) as executor:
+            parts = list(executor.map(lambda part: request_ssml(part, use_cache), labelled))
 
     except requests.exceptions.RequestException as e:
         print(f"Error converting {filename}: {e}")
         return None
 
+    # Stitch the parts back into a single <speak> document
+    body = "\n".join(speak_body(part) for part in parts)
+    return f"<speak>\n{body}\n</speak>"
+
 
-def process_notebook():
+def convert_one(md_file, rel_path, ssml_file, use_cache=True):
+    """Read, convert and save a single markdown file. Returns its manifest entry."""
+    # Read markdown content
+    try:
+        content = sanitize_markdown(read_markdown_file(md_file))
+    except Exception as e:
+        print(f"Error reading {md_file}: {e}")
+        return {
+            "source": str(rel_path),
+            "status": "read_failed",
+            "error": str(e)
+        }
+
+    # Convert to SSML
+    ssml_content = convert_to_ssml(content, rel_path, use_cache)
+
+    if not ssml_content:
+        return {
+            "source": str(rel_path),
+            "status": "conversion_failed"
+        }
+
+    # Save SSML file via a temp file + rename, so an interrupted run never
+    # leaves a truncated .ssml that looks up to date
+    tmp_file = ssml_file.with_suffix('.ssml.tmp')
+    try:
+        tmp_file.write_text(ssml_content, encoding='utf-8')
+        os.replace(tmp_file, ssml_file)
+        print(f"✓ Saved to: {ssml_file.relative_to(OUTPUT_DIR)}")
+
+        return {
+            "source": str(rel_path),
+            "output": str(ssml_file.relative_to(OUTPUT_DIR)),
+            "status": "success",
+            "source_mtime": md_file.stat().st_mtime
+        }
+    except Exception as e:
+        print(f"Error saving {ssml_file}: {e}")
+        return {
+            "source": str(rel_path),
+            "output": str(ssml_file.relative_to(OUTPUT_DIR)),
+            "status": "error",
+            "error": str(e)
+        }
+
+
+def process_notebook(workers=DEFAULT_WORKERS, force=False):
     """Process all markdown files in the notebook directory."""
     # Create output directory
     OUTPUT_DIR.mkdir(exist_ok=True)
 
     # Get all markdown files
-    md_files = sorted(NOTEBOOK_DIR.rglob("*.md"))
+    md_files = sorted(Path(p) for p in glob.iglob(os.path.join(NOTEBOOK_DIR, "**", "*.md"), recursive=True))
 
     print(f"Found {len(md_files)} markdown files to process")
 
@@ -106,7 +325,9 @@ def process_notebook():
         "files": []
     }
 
-    for i, md_file in enumerate(md_files, 1):
+    # Build the task list and output directory structure up-front
+    tasks = []
+    for md_file in md_files:
         # Get relative path for organizing output
         rel_path = md_file.relative_to(NOTEBOOK_DIR)
 
@@ -117,48 +338,41 @@ def process_notebook():
         # Output SSML file path
         ssml_file = output_subdir / f"{md_file.stem}.ssml"
 
-        print(f"\n[{i}/{len(md_files)}] Processing: {rel_path}")
-
-        # Read markdown content
-        try:
-            content = read_markdown_file(md_file)
-        except Exception as e:
-            print(f"Error reading {md_file}: {e}")
-            continue
-
-        # Convert to SSML
-        ssml_content = convert_to_ssml(content, rel_path)
-
-        if ssml_content:
-            # Save SSML file
-            try:
-                with open(ssml_file, 'w', encoding='utf-8') as f:
-                    f.write(ssml_content)
-                print(f"✓ Saved to: {ssml_file.relative_to(OUTPUT_DIR)}")
-
-                manifest["files"].append({
-                    "source": str(rel_path),
-                    "output": str(ssml_file.relative_to(OUTPUT_DIR)),
-                    "status": "success"
-                })
-            except Exception as e:
-                print(f"Error saving {ssml_file}: {e}")
-                manifest["files"].append({
-                    "source": str(rel_path),
-                    "output": str(ssml_file.relative_to(OUTPUT_DIR)),
-                    "status": "error",
-                    "error": str(e)
-                })
-        else:
+        # Skip files whose SSML is newer than the markdown it came from
+        src_mtime = md_file.stat().st_mtime
+        out_mtime = ssml_file.stat().st_mtime if ssml_file.exists() else -1
+        if out_mtime >= src_mtime and not force:
             manifest["files"].append({
                 "source": str(rel_path),
-                "status": "conversion_failed"
+                "output": str(ssml_file.relative_to(OUTPUT_DIR)),
+                "status": "cached",
+                "source_mtime": src_mtime
             })
+            continue
+
+        tasks.append((md_file, rel_path, ssml_file))
+
+    cached = len(md_files) - len(tasks)
+    if cached:
+        print(f"Skipping {cached} up-to-date files (use --force to reconvert)")
+
+    print(f"Converting {len(tasks)} files with {workers} parallel workers")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # --force also bypasses the response cache, for a fresh conversion
+        futures = {executor.submit(convert_one, *task, not force): task for task in tasks}
+
+        for i, future in enumerate(as_completed(futures), 1):
+            rel_path = futures[future][1]
+            print(f"[{i}/{len(tasks)}] Finished: {rel_path}")
+            manifest["files"].append(future.result())
+
+    # Keep the manifest in source order regardless of completion order
+    manifest["files"].sort(key=lambda entry: entry["source"])
 
     # Save manifest
     manifest_file = OUTPUT_DIR / "manifest.json"
-    with open(manifest_file, 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=2)
+    dump_manifest(manifest, manifest_file)
 
     print(f"\n✓ Conversion complete!")
     print(f"✓ SSML files saved to: {OUTPUT_DIR}")
@@ -167,12 +381,21 @@ def process_notebook():
 
 def main():
     """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert notebook markdown files to SSML")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of concurrent OpenRouter requests (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--force", action="store_true", help="Reconvert files even if their SSML is up to date or cached")
+
+    args = parser.parse_args()
+
     print("=" * 60)
     print("STT Fine-Tuning Notebook → SSML Converter")
     print("=" * 60)
     print()
 
-    process_notebook()
+    process_notebook(workers=args.workers, force=args.force)
 
 
 if __name__ == "__main__":
@@ -106,9 +106,13 @@ def concatenate_audio_files(audio_files, output_file):
     file_list_path = OUTPUT_DIR / "concat_list.txt"
 
     try:
-        with open(file_list_path, 'w', encoding='utf-8') as f:
-            for audio_file in audio_files:
-                f.write(f"file '{audio_file.absolute()}'\n")
+        # FFmpeg concat needs absolute paths; resolve against the cwd once
+        # and write the whole list in a single call
+        cwd = os.getcwd()
+        file_list_path.write_text(
+            "".join(f"file '{os.path.join(cwd, audio_file)}'\n" for audio_file in audio_files),
+            encoding='utf-8'
+        )
 
         # Use ffmpeg to concatenate
         cmd = [
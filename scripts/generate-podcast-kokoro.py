@@ -1,69 +1,248 @@
 #!/usr/bin/env python3
 """
 Generate podcast audio from SSML files using Kokoro-82M TTS from Hugging Face.
-This script processes SSML files and converts them to audio using the Kokoro TTS model.
+This script processes SSML files and converts them to audio using the Kokoro TTS model,
+either through the Hugging Face Inference API or locally (--backend local / onnx).
 """
 
 import os
 import sys
+import glob
 from pathlib import Path
 import json
+try:
+    import orjson  # Optional: much faster manifest serialization
+except ImportError:
+    orjson = None
 import subprocess
 from datetime import datetime
-import requests
+import asyncio
 import re
+import xml.etree.ElementTree as ET
 
 # Configuration
 SSML_DIR = Path(__file__).parent.parent / "podcast-ssml"
 OUTPUT_DIR = Path(__file__).parent.parent / "podcast-audio"
 
-# Hugging Face configuration
+# Hugging Face configuration (only needed for the hosted "hf" backend)
 HF_API_KEY = os.getenv("HF_TOKEN") or os.getenv("HF_API_KEY")
-if not HF_API_KEY:
-    print("Error: HF_TOKEN or HF_API_KEY environment variable not set")
-    print("Get your token from: https://huggingface.co/settings/tokens")
-    sys.exit(1)
 
 KOKORO_MODEL = "hexgrad/Kokoro-82M"
 HF_API_URL = f"https://router.huggingface.co/models/{KOKORO_MODEL}"
+AUDIO_CHUNK_SIZE = 64 * 1024  # Bytes written per chunk when streaming audio to disk
 
-def strip_ssml_tags(ssml_content):
-    """Remove SSML tags and return plain text for TTS."""
-    # Remove <?xml ... ?> declaration
-    text = re.sub(r'<\?xml[^>]*\?>', '', ssml_content)
+# Local inference configuration (the "local" backend)
+KOKORO_SAMPLE_RATE = 24000  # Kokoro outputs 24kHz mono
+DEFAULT_VOICE = "af_heart"  # American English, female
+LOCAL_SEGMENT_CHARS = 800  # Roughly 200 tokens of text per segment fed to the pipeline
+
+# CPU-only inference with an int8-quantized ONNX export (the "onnx" backend).
+# Model and voices come from https://github.com/thewh1teagle/kokoro-onnx/releases
+ONNX_MODEL_DIR = Path(__file__).parent / "models"
+ONNX_MODEL_FP32 = ONNX_MODEL_DIR / "kokoro-v1.0.onnx"
+ONNX_MODEL_INT8 = ONNX_MODEL_DIR / "kokoro-v1.0.int8.onnx"
+ONNX_VOICES = ONNX_MODEL_DIR / "voices-v1.0.bin"
+
+# ONNX Runtime session, created once and shared by every file
+_ONNX_KOKORO = None
+
+# Hugging Face requests run concurrently on one HTTP/2 connection; rate limits
+# and transient server errors are retried with exponential backoff
+HF_CONCURRENCY = 8
+HF_MAX_RETRIES = 5
+HF_BACKOFF_FACTOR = 1.5
+HF_RETRY_STATUSES = {429, 500, 502, 503, 504}
 
-    # Remove <speak> tags
-    text = re.sub(r'<speak[^>]*>', '', text)
-    text = re.sub(r'</speak>', '', text)
 
-    # Remove break tags
-    text = re.sub(r'<break[^>]*/?>', ' ', text)
+def dump_manifest(manifest, path):
+    """Write a manifest as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
 
-    # Remove prosody tags but keep content
-    text = re.sub(r'<prosody[^>]*>', '', text)
-    text = re.sub(r'</prosody>', '', text)
 
-    # Remove emphasis tags but keep content
-    text = re.sub(r'<emphasis[^>]*>', '', text)
-    text = re.sub(r'</emphasis>', '', text)
+# SSML stripping patterns, compiled once at import
+# Formatting tags (and the XML declaration) are dropped but their content kept
+_SSML_TAG_RE = re.compile(r'<\?xml[^>]*\?>|</?(?:speak|prosody|emphasis|say-as)[^>]*>')
+# Breaks and paragraph boundaries become whitespace so words don't run together
+_SSML_BREAK_RE = re.compile(r'<break[^>]*/?>|</?p>')
+_WS_RE = re.compile(r'\s+')
 
-    # Remove say-as tags but keep content
-    text = re.sub(r'<say-as[^>]*>', '', text)
-    text = re.sub(r'</say-as>', '', text)
 
-    # Remove paragraph tags but keep content
-    text = re.sub(r'<p>', '\n\n', text)
-    text = re.sub(r'</p>', '\n\n', text)
+def _strip_ssml_tags_regex(ssml_content):
+    """Regex fallback for SSML that isn't well-formed XML."""
+    text = _SSML_TAG_RE.sub('', ssml_content)
+    text = _SSML_BREAK_RE.sub(' ', text)
 
     # Clean up extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
+    return _WS_RE.sub(' ', text).strip()
+
+
+def _collect_ssml_text(elem, parts):
+    """Append the spoken text under elem to parts, in document order."""
+    if elem.text:
+        parts.append(elem.text)
+
+    for child in elem:
+        # Drop any namespace, e.g. {http://www.w3.org/2001/10/synthesis}break
+        tag = child.tag.rpartition('}')[2]
+        if tag == 'break':
+            parts.append(' ')
+        elif tag == 'p':
+            parts.append('\n\n')
+
+        _collect_ssml_text(child, parts)
 
-    return text
+        if tag == 'p':
+            parts.append('\n\n')
+        if child.tail:
+            parts.append(child.tail)
+
+
+def strip_ssml_tags(ssml_content):
+    """Remove SSML tags and return plain text for TTS."""
+    try:
+        root = ET.fromstring(ssml_content)
+    except ET.ParseError:
+        # LLM output isn't always valid XML (stray markdown fences, bare &)
+        return _strip_ssml_tags_regex(ssml_content)
+
+    parts = []
+    _collect_ssml_text(root, parts)
+
+    # Clean up extra whitespace
+    return _WS_RE.sub(' ', ''.join(parts)).strip()
 
 
-def convert_ssml_to_audio_kokoro(ssml_file, output_file):
+def temp_path_for(path):
+    """Sibling temp path that a finished file is atomically renamed from."""
+    return path.with_suffix(path.suffix + '.tmp')
+
+
+async def convert_ssml_to_audio_kokoro(client, semaphore, ssml_file, output_file):
     """Convert SSML file to audio using Kokoro-82M via Hugging Face API."""
+    import aiofiles
+
+    async with semaphore:
+        print(f"Converting {ssml_file.name} to audio...")
+
+        tmp_file = temp_path_for(output_file)
+
+        try:
+            # Read SSML content
+            ssml_content = ssml_file.read_text(encoding='utf-8')
+
+            # Strip SSML tags to get plain text
+            text = strip_ssml_tags(ssml_content)
+
+            if not text:
+                print(f"Warning: No text content found in {ssml_file.name}")
+                return False
+
+            # Call Hugging Face Inference API
+            headers = {
+                "Authorization": f"Bearer {HF_API_KEY}"
+            }
+
+            payload = {
+                "inputs": text
+            }
+
+            for attempt in range(HF_MAX_RETRIES + 1):
+                # Stream the response so the WAV never has to sit in memory in full
+                async with client.stream("POST", HF_API_URL, headers=headers, json=payload) as response:
+                    if response.status_code == 200:
+                        # Save audio file
+                        async with aiofiles.open(tmp_file, 'wb') as f:
+                            async for chunk in response.aiter_bytes(AUDIO_CHUNK_SIZE):
+                                await f.write(chunk)
+                        os.replace(tmp_file, output_file)
+                        print(f"✓ Audio saved to: {output_file}")
+                        return True
+
+                    if response.status_code not in HF_RETRY_STATUSES or attempt == HF_MAX_RETRIES:
+                        await response.aread()
+                        print(f"Error: {response.status_code} - {response.text}")
+                        return False
+
+                delay = HF_BACKOFF_FACTOR * 2 ** attempt
+                print(f"HTTP {response.status_code} for {ssml_file.name}, retrying in {delay:.1f}s...")
+                await asyncio.sleep(delay)
+
+        except Exception as e:
+            print(f"Error converting {ssml_file.name}: {e}")
+            tmp_file.unlink(missing_ok=True)
+            return False
+
+
+async def convert_all_kokoro_hf(tasks, concurrency=HF_CONCURRENCY):
+    """Convert (ssml_file, audio_file) pairs concurrently via the Hugging Face API.
+
+    Returns a success flag per task, in task order.
+    """
+    try:
+        import httpx
+        import aiofiles  # noqa: F401 (used by convert_ssml_to_audio_kokoro)
+    except ImportError:
+        print("Error: httpx and aiofiles are required for the Hugging Face backend")
+        print("Install with: pip install 'httpx[http2]' aiofiles")
+        sys.exit(1)
+
+    # HTTP/2 multiplexes every request over one connection; it needs the h2 extra
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(http2=http2, timeout=300) as client:
+        return await asyncio.gather(*(
+            convert_ssml_to_audio_kokoro(client, semaphore, ssml_file, audio_file)
+            for ssml_file, audio_file in tasks
+        ))
+
+
+def load_kokoro_pipeline(device=None):
+    """Load Kokoro-82M for local inference (on the GPU when one is available)."""
+    try:
+        from kokoro import KPipeline
+    except ImportError:
+        print("Error: kokoro package not installed")
+        print("Install with: pip install kokoro soundfile")
+        sys.exit(1)
+
+    print("Loading Kokoro-82M locally...")
+    pipeline = KPipeline(lang_code='a', repo_id=KOKORO_MODEL, device=device)
+    print("✓ Kokoro model loaded")
+    return pipeline
+
+
+def split_text_segments(text, max_chars=LOCAL_SEGMENT_CHARS):
+    """Group sentences into segments of at most max_chars characters."""
+    segments = []
+    current = ""
+
+    for sentence in re.split(r'(?<=[.!?])\s+', text):
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            segments.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+
+    if current:
+        segments.append(current)
+
+    return segments
+
+
+def convert_ssml_to_audio_local(ssml_file, output_file, pipeline, voice=DEFAULT_VOICE):
+    """Convert SSML file to audio by running Kokoro-82M locally."""
+    import numpy as np
+    import soundfile as sf
+
     print(f"Converting {ssml_file.name} to audio...")
 
     try:
@@ -78,32 +257,117 @@ def convert_ssml_to_audio_kokoro(ssml_file, output_file):
             print(f"Warning: No text content found in {ssml_file.name}")
             return False
 
-        # Call Hugging Face Inference API
-        headers = {
-            "Authorization": f"Bearer {HF_API_KEY}"
-        }
+        # The pipeline takes the pre-split segments in one call and yields
+        # audio for each in turn, so the model is loaded and warm only once
+        audio_chunks = [
+            result.audio.cpu().numpy()
+            for result in pipeline(split_text_segments(text), voice=voice, speed=1.0)
+            if result.audio is not None
+        ]
 
-        payload = {
-            "inputs": text
-        }
+        if not audio_chunks:
+            print(f"Error: Kokoro produced no audio for {ssml_file.name}")
+            return False
 
-        response = requests.post(
-            HF_API_URL,
-            headers=headers,
-            json=payload,
-            timeout=300
-        )
+        tmp_file = temp_path_for(output_file)
+        sf.write(tmp_file, np.concatenate(audio_chunks), KOKORO_SAMPLE_RATE, format='WAV')
+        os.replace(tmp_file, output_file)
+        print(f"✓ Audio saved to: {output_file}")
+        return True
 
-        if response.status_code == 200:
-            # Save audio file
-            with open(output_file, 'wb') as f:
-                f.write(response.content)
-            print(f"✓ Audio saved to: {output_file}")
-            return True
-        else:
-            print(f"Error: {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"Error converting {ssml_file.name}: {e}")
+        return False
+
+
+def load_kokoro_onnx():
+    """Load Kokoro-82M as an int8 ONNX model on the CPU, quantizing it on first use."""
+    global _ONNX_KOKORO
+    if _ONNX_KOKORO is not None:
+        return _ONNX_KOKORO
+
+    try:
+        import onnxruntime as ort
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        from kokoro_onnx import Kokoro
+    except ImportError:
+        print("Error: ONNX backend dependencies not installed")
+        print("Install with: pip install onnxruntime kokoro-onnx soundfile")
+        sys.exit(1)
+
+    if not ONNX_VOICES.exists():
+        print(f"Error: {ONNX_VOICES.name} not found in {ONNX_MODEL_DIR}")
+        print("Download it from: https://github.com/thewh1teagle/kokoro-onnx/releases")
+        sys.exit(1)
+
+    if not ONNX_MODEL_INT8.exists():
+        if not ONNX_MODEL_FP32.exists():
+            print(f"Error: neither {ONNX_MODEL_INT8.name} nor {ONNX_MODEL_FP32.name} found in {ONNX_MODEL_DIR}")
+            print("Download either from: https://github.com/thewh1teagle/kokoro-onnx/releases")
+            print(f"(the prebuilt {ONNX_MODEL_INT8.name} can be used as-is; the fp32 model is quantized here)")
+            sys.exit(1)
+
+        # Weights-only dynamic quantization of the matmuls, which dominate
+        # inference. Convolutions stay fp32: ONNX Runtime's CPU provider has no
+        # ConvInteger kernel for the int8 weights quantize_dynamic would produce
+        print("Quantizing Kokoro-82M to int8 (one-off)...")
+        tmp_model = temp_path_for(ONNX_MODEL_INT8)
+        try:
+            quantize_dynamic(str(ONNX_MODEL_FP32), str(tmp_model), weight_type=QuantType.QInt8,
+                             op_types_to_quantize=["MatMul"])
+        except Exception as e:
+            tmp_model.unlink(missing_ok=True)
+            print(f"Error quantizing {ONNX_MODEL_FP32.name}: {e}")
+            sys.exit(1)
+        # Publish only a complete model, so an interrupted run is redone
+        os.replace(tmp_model, ONNX_MODEL_INT8)
+
+    print("Loading Kokoro-82M (int8 ONNX, CPU)...")
+    try:
+        so = ort.SessionOptions()
+        so.intra_op_num_threads = os.cpu_count()
+        session = ort.InferenceSession(str(ONNX_MODEL_INT8), sess_options=so, providers=["CPUExecutionProvider"])
+        _ONNX_KOKORO = Kokoro.from_session(session, str(ONNX_VOICES))
+    except Exception as e:
+        print(f"Error loading {ONNX_MODEL_INT8.name} / {ONNX_VOICES.name}: {e}")
+        print(f"Delete {ONNX_MODEL_INT8} to re-quantize it, or replace it with the prebuilt release file")
+        sys.exit(1)
+
+    print("✓ Kokoro model loaded")
+    return _ONNX_KOKORO
+
+
+def convert_ssml_to_audio_onnx(ssml_file, output_file, kokoro, voice=DEFAULT_VOICE):
+    """Convert SSML file to audio with the int8 ONNX Kokoro model."""
+    import numpy as np
+    import soundfile as sf
+
+    print(f"Converting {ssml_file.name} to audio...")
+
+    try:
+        # Read SSML content
+        with open(ssml_file, 'r', encoding='utf-8') as f:
+            ssml_content = f.read()
+
+        # Strip SSML tags to get plain text
+        text = strip_ssml_tags(ssml_content)
+
+        if not text:
+            print(f"Warning: No text content found in {ssml_file.name}")
             return False
 
+        audio_chunks = []
+        sample_rate = KOKORO_SAMPLE_RATE
+        for segment in split_text_segments(text):
+            samples, sample_rate = kokoro.create(segment, voice=voice, speed=1.0, lang="en-us")
+            audio_chunks.append(samples)
+
+        tmp_file = temp_path_for(output_file)
+        sf.write(tmp_file, np.concatenate(audio_chunks), sample_rate, format='WAV')
+        os.replace(tmp_file, output_file)
+        print(f"✓ Audio saved to: {output_file}")
+        return True
+
     except Exception as e:
         print(f"Error converting {ssml_file.name}: {e}")
         return False
@@ -113,29 +377,27 @@ def concatenate_audio_files(audio_files, output_file):
     """Concatenate multiple audio files into a single podcast episode."""
     print(f"\nConcatenating {len(audio_files)} audio files...")
 
-    # Create a temporary file list for ffmpeg
-    file_list_path = OUTPUT_DIR / "concat_list.txt"
+    # The concat demuxer with -c copy can't rewrite the RIFF length header and
+    # breaks if sample rates differ, so decode every track through the concat
+    # filter and re-encode to PCM in a single pass
+    cmd = ["ffmpeg", "-y"]  # Overwrite output file
+    for audio_file in audio_files:
+        cmd += ["-i", str(audio_file)]
+    # Render to a temp file (format given explicitly, since ffmpeg can't
+    # infer it from the .tmp extension) and rename once complete
+    tmp_file = temp_path_for(output_file)
+    cmd += [
+        "-filter_complex", f"concat=n={len(audio_files)}:v=0:a=1",
+        "-c:a", "pcm_s16le",
+        "-f", "wav",
+        str(tmp_file)
+    ]
 
     try:
-        with open(file_list_path, 'w', encoding='utf-8') as f:
-            for audio_file in audio_files:
-                # FFmpeg concat requires relative or absolute paths in specific format
-                f.write(f"file '{audio_file.absolute()}'\n")
-
-        # Use ffmpeg to concatenate
-        cmd = [
-            "ffmpeg",
-            "-f", "concat",
-            "-safe", "0",
-            "-i", str(file_list_path),
-            "-c", "copy",
-            "-y",  # Overwrite output file
-            str(output_file)
-        ]
-
         result = subprocess.run(cmd, capture_output=True, text=True)
 
         if result.returncode == 0:
+            os.replace(tmp_file, output_file)
             print(f"✓ Podcast saved to: {output_file}")
             return True
         else:
@@ -146,12 +408,11 @@ def concatenate_audio_files(audio_files, output_file):
         print(f"Error concatenating audio: {e}")
         return False
     finally:
-        # Clean up temporary file list
-        if file_list_path.exists():
-            file_list_path.unlink()
+        tmp_file.unlink(missing_ok=True)
 
 
-def process_ssml_directory(concatenate=True):
+def process_ssml_directory(concatenate=True, force=False, backend="hf", voice=DEFAULT_VOICE, device=None,
+                           concurrency=HF_CONCURRENCY):
     """Process all SSML files in the directory."""
     # Create output directory
     OUTPUT_DIR.mkdir(exist_ok=True)
@@ -166,7 +427,7 @@ def process_ssml_directory(concatenate=True):
         manifest = json.load(f)
 
     # Get all SSML files
-    ssml_files = sorted(SSML_DIR.rglob("*.ssml"))
+    ssml_files = sorted(Path(p) for p in glob.iglob(os.path.join(SSML_DIR, "**", "*.ssml"), recursive=True))
 
     if not ssml_files:
         print("Error: No SSML files found. Run convert-to-ssml.py first.")
@@ -174,18 +435,21 @@ def process_ssml_directory(concatenate=True):
 
     print(f"Found {len(ssml_files)} SSML files to process")
 
-    # Create podcast manifest
-    podcast_manifest = {
-        "generated_at": datetime.now().isoformat(),
-        "tts_engine": "kokoro-82m",
-        "model": KOKORO_MODEL,
-        "total_files": len(ssml_files),
-        "files": []
-    }
-
-    audio_files = []
+    # The hf backend has no voice option, so only the local backends record one
+    track_voice = None if backend == "hf" else voice
 
-    for i, ssml_file in enumerate(ssml_files, 1):
+    # What each existing track was rendered with, from the previous run
+    previous = {}
+    previous_manifest_file = OUTPUT_DIR / "individual-files-manifest.json"
+    try:
+        for entry in json.loads(previous_manifest_file.read_text(encoding='utf-8'))["files"]:
+            previous[entry["ssml_source"]] = (entry.get("backend"), entry.get("voice"))
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # Work out output paths and which files are already up to date
+    jobs = []
+    for ssml_file in ssml_files:
         # Get relative path for organizing output
         rel_path = ssml_file.relative_to(SSML_DIR)
 
@@ -196,17 +460,69 @@ def process_ssml_directory(concatenate=True):
         # Output audio file path (Kokoro outputs WAV by default)
         audio_file = output_subdir / f"{ssml_file.stem}.wav"
 
-        print(f"\n[{i}/{len(ssml_files)}] Processing: {rel_path}")
+        # Skip files whose audio is newer than the SSML it came from and was
+        # rendered with the same backend and voice
+        src_mtime = ssml_file.stat().st_mtime
+        out_mtime = audio_file.stat().st_mtime if audio_file.exists() else -1
+        up_to_date = (
+            not force
+            and out_mtime >= src_mtime
+            and previous.get(str(rel_path)) == (backend, track_voice)
+        )
+
+        jobs.append((ssml_file, rel_path, audio_file, src_mtime, up_to_date))
+
+    pending = [(ssml_file, audio_file) for ssml_file, _, audio_file, _, up_to_date in jobs if not up_to_date]
+    if len(pending) < len(jobs):
+        print(f"Skipping {len(jobs) - len(pending)} up-to-date files (use --force to regenerate)")
+
+    # Convert to audio (without loading a model when there is nothing to do)
+    if not pending:
+        results = []
+    elif backend == "hf":
+        results = asyncio.run(convert_all_kokoro_hf(pending, concurrency))
+    else:
+        # Local models run one file at a time on the loaded model
+        if backend == "local":
+            pipeline = load_kokoro_pipeline(device)
+
+            def convert(ssml_file, audio_file):
+                return convert_ssml_to_audio_local(ssml_file, audio_file, pipeline, voice)
+        else:
+            kokoro = load_kokoro_onnx()
+
+            def convert(ssml_file, audio_file):
+                return convert_ssml_to_audio_onnx(ssml_file, audio_file, kokoro, voice)
+
+        results = []
+        for i, (ssml_file, audio_file) in enumerate(pending, 1):
+            print(f"\n[{i}/{len(pending)}] Processing: {ssml_file.relative_to(SSML_DIR)}")
+            results.append(convert(ssml_file, audio_file))
+
+    converted = {audio_file: success for (_, audio_file), success in zip(pending, results)}
+
+    # Create podcast manifest
+    podcast_manifest = {
+        "generated_at": datetime.now().isoformat(),
+        "tts_engine": "kokoro-82m",
+        "model": KOKORO_MODEL,
+        "backend": backend,
+        "total_files": len(ssml_files),
+        "files": []
+    }
 
-        # Convert to audio
-        success = convert_ssml_to_audio_kokoro(ssml_file, audio_file)
+    audio_files = []
 
-        if success:
+    for ssml_file, rel_path, audio_file, src_mtime, up_to_date in jobs:
+        if up_to_date or converted[audio_file]:
             audio_files.append(audio_file)
             podcast_manifest["files"].append({
                 "ssml_source": str(rel_path),
                 "audio_output": str(audio_file.relative_to(OUTPUT_DIR)),
-                "status": "success"
+                "status": "cached" if up_to_date else "success",
+                "source_mtime": src_mtime,
+                "backend": backend,
+                "voice": track_voice
             })
         else:
             podcast_manifest["files"].append({
@@ -216,8 +532,7 @@ def process_ssml_directory(concatenate=True):
 
     # Save individual files manifest
     individual_manifest_file = OUTPUT_DIR / "individual-files-manifest.json"
-    with open(individual_manifest_file, 'w', encoding='utf-8') as f:
-        json.dump(podcast_manifest, f, indent=2)
+    dump_manifest(podcast_manifest, individual_manifest_file)
 
     print(f"\n✓ Individual audio files generated!")
     print(f"✓ Manifest saved to: {individual_manifest_file}")
@@ -229,7 +544,31 @@ def process_ssml_directory(concatenate=True):
         print("=" * 60)
 
         full_podcast_file = OUTPUT_DIR / f"stt-finetune-podcast-{datetime.now().strftime('%Y%m%d')}.wav"
-        if concatenate_audio_files(audio_files, full_podcast_file):
+
+        tracks = [str(f.relative_to(OUTPUT_DIR)) for f in audio_files]
+        final_manifest_file = OUTPUT_DIR / "podcast-manifest.json"
+
+        # Tracks the existing podcast was built from, per the last manifest
+        try:
+            previous_podcast = json.loads(final_manifest_file.read_text(encoding='utf-8'))["full_podcast"]
+        except (OSError, ValueError, KeyError):
+            previous_podcast = None
+
+        # Only skip ffmpeg if the podcast was built from exactly these tracks,
+        # in this order, and none of them has changed since
+        newest_input = max(f.stat().st_mtime for f in audio_files)
+        podcast_up_to_date = (
+            not force
+            and full_podcast_file.exists()
+            and isinstance(previous_podcast, dict)
+            and previous_podcast.get("file") == str(full_podcast_file.relative_to(OUTPUT_DIR))
+            and previous_podcast.get("tracks") == tracks
+            and full_podcast_file.stat().st_mtime >= newest_input
+        )
+        if podcast_up_to_date:
+            print(f"✓ Podcast already up to date: {full_podcast_file}")
+
+        if podcast_up_to_date or concatenate_audio_files(audio_files, full_podcast_file):
             # Get file size
             file_size_mb = full_podcast_file.stat().st_size / (1024 * 1024)
 
@@ -237,13 +576,12 @@ def process_ssml_directory(concatenate=True):
             podcast_manifest["full_podcast"] = {
                 "file": str(full_podcast_file.relative_to(OUTPUT_DIR)),
                 "size_mb": round(file_size_mb, 2),
-                "track_count": len(audio_files)
+                "track_count": len(audio_files),
+                "tracks": tracks
             }
 
             # Save final manifest
-            final_manifest_file = OUTPUT_DIR / "podcast-manifest.json"
-            with open(final_manifest_file, 'w', encoding='utf-8') as f:
-                json.dump(podcast_manifest, f, indent=2)
+            dump_manifest(podcast_manifest, final_manifest_file)
 
             print(f"\n✓ Full podcast created!")
             print(f"  File: {full_podcast_file}")
@@ -257,9 +595,22 @@ def main():
 
     parser = argparse.ArgumentParser(description="Generate podcast audio from SSML using Kokoro-82M")
     parser.add_argument("--no-concatenate", action="store_true", help="Don't concatenate into single file")
+    parser.add_argument("--force", action="store_true", help="Regenerate audio even if it is up to date")
+    parser.add_argument("--backend", choices=["hf", "local", "onnx"], default="hf",
+                        help="Run Kokoro via the Hugging Face API (hf), locally with PyTorch (local) "
+                             "or as an int8 ONNX model on the CPU (onnx)")
+    parser.add_argument("--voice", default=DEFAULT_VOICE, help=f"Voice for the local/onnx backends (default: {DEFAULT_VOICE})")
+    parser.add_argument("--device", help="Torch device for the local backend, e.g. cuda or cpu (default: auto)")
+    parser.add_argument("--concurrency", type=int, default=HF_CONCURRENCY,
+                        help=f"Concurrent Hugging Face requests for the hf backend (default: {HF_CONCURRENCY})")
 
     args = parser.parse_args()
 
+    if args.backend == "hf" and not HF_API_KEY:
+        print("Error: HF_TOKEN or HF_API_KEY environment variable not set")
+        print("Get your token from: https://huggingface.co/settings/tokens")
+        sys.exit(1)
+
     print("=" * 60)
     print("STT Fine-Tuning Podcast Generator - Kokoro-82M TTS")
     print("=" * 60)
@@ -275,7 +626,14 @@ def main():
             print("  sudo apt install ffmpeg")
             args.no_concatenate = True
 
-    process_ssml_directory(concatenate=not args.no_concatenate)
+    process_ssml_directory(
+        concatenate=not args.no_concatenate,
+        force=args.force,
+        backend=args.backend,
+        voice=args.voice,
+        device=args.device,
+        concurrency=args.concurrency
+    )
 
 
 if __name__ == "__main__":
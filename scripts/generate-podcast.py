@@ -8,66 +8,181 @@ import os
 import sys
 from pathlib import Path
 import json
+import mmap
+try:
+    import orjson  # Optional: much faster manifest serialization
+except ImportError:
+    orjson = None
 import subprocess
+import tempfile
+import asyncio
+import hashlib
+import html
+import re
+import shutil
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+import xml.etree.ElementTree as ET
+
+# Check for edge-tts and aiofiles libraries
+try:
+    import edge_tts
+    import aiofiles
+    import aiohttp
+except ImportError as e:
+    print(f"Error: {e.name} library not installed")
+    print("Install with: pip install edge-tts aiofiles")
+    sys.exit(1)
 
 # Configuration
 SSML_DIR = Path(__file__).parent.parent / "podcast-ssml"
 OUTPUT_DIR = Path(__file__).parent.parent / "podcast-audio"
 
+# Content-addressed audio cache: <BLAKE2b of SSML keyed by voice>.mp3, so unchanged
+# files are never sent to the TTS service twice
+CACHE_DIR = OUTPUT_DIR / ".cache"
+
+# SSML files at least this big are hashed through mmap rather than read whole
+MMAP_HASH_THRESHOLD = 1024 * 1024
+
 # TTS Configuration - Using edge-tts (Microsoft Edge TTS) as a free, high-quality option
 # Alternative options: Google Cloud TTS, AWS Polly, Azure TTS, or local solutions like Coqui TTS
 DEFAULT_VOICE = "en-US-AriaNeural"  # Female voice, good for educational content
 # Other options: en-US-GuyNeural (male), en-US-JennyNeural (female), en-GB-SoniaNeural (British)
 
-def check_edge_tts():
-    """Check if edge-tts is installed."""
+# Files are synthesized concurrently; each one is almost entirely network wait
+DEFAULT_CONCURRENCY = 8
+
+# Loudness normalization (--normalize): EBU R128 targets for spoken word. The
+# output keeps edge-tts's 24 kHz mono 48 kbps format, and bare MP3 frames with
+# no ID3 tag or Xing header, so tracks can still be joined byte for byte
+LOUDNORM_FILTER = "loudnorm=I=-16:TP=-1.5:LRA=11"
+EDGE_TTS_AUDIO_ARGS = ["-ar", "24000", "-ac", "1", "-b:a", "48k",
+                       "-map_metadata", "-1", "-id3v2_version", "0", "-write_xing", "0"]
+
+# Documents with more spoken text than this are split at element boundaries
+# into parts that are synthesized concurrently, then joined
+SPLIT_CHARS = 10_000
+
+# Per-user cache for results that rarely change between runs (tool probes)
+USER_CACHE_DIR = Path.home() / ".cache" / "podcast-gen"
+USER_CACHE_TTL = 24 * 60 * 60  # seconds
+
+def strip_ssml_tags(ssml_content):
+    """Remove SSML tags and return plain text for TTS.
+
+    edge-tts escapes the text it is given, so any markup left in would be
+    read out loud.
+    """
+    text = html.unescape(re.sub(r'<[^>]+>', ' ', ssml_content))
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def split_ssml_text(ssml_content, max_chars=SPLIT_CHARS):
+    """Split SSML into roughly equal plain-text parts of about max_chars.
+
+    Parts break between the top-level children of <speak> (paragraphs,
+    sentences), never inside one. Unparseable SSML comes back as one part.
+    """
     try:
-        subprocess.run(["edge-tts", "--version"], capture_output=True, check=True)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+        root = ET.fromstring(ssml_content)
+    except ET.ParseError:
+        return [strip_ssml_tags(ssml_content)]
+
+    # tostring() includes each child's tail text, so nothing is lost
+    blocks = [strip_ssml_tags(root.text or "")]
+    blocks += [strip_ssml_tags(ET.tostring(child, encoding='unicode')) for child in root]
+    blocks = [block for block in blocks if block]
+
+    total = sum(len(block) for block in blocks)
+    target = total / -(-total // max_chars)  # ceil(total / max_chars) parts
+
+    parts, current, size = [], [], 0
+    for block in blocks:
+        if current and size + len(block) > target:
+            parts.append(" ".join(current))
+            current, size = [], 0
+        current.append(block)
+        size += len(block)
+    if current:
+        parts.append(" ".join(current))
+    return parts
+
+
+class SharedConnector(aiohttp.TCPConnector):
+    """Connection pool shared by every edge-tts request in a run.
+
+    edge-tts opens its own ClientSession per synthesis, and a session closes
+    its connector on exit. Ignore those closes so the pool (and its DNS cache)
+    stays warm across files; call shutdown() once at the end instead.
+    """
+
+    def close(self, *args, **kwargs):
+        return asyncio.sleep(0)
+
+    async def shutdown(self):
+        await super().close()
+
+
+async def stream_to_file(text, output_file, voice=DEFAULT_VOICE, connector=None):
+    """Write edge-tts audio chunks to output_file as they arrive."""
+    async with aiofiles.open(output_file, 'wb') as f:
+        async for chunk in edge_tts.Communicate(text, voice, connector=connector).stream():
+            if chunk["type"] == "audio":
+                await f.write(chunk["data"])
 
 
-def install_edge_tts():
-    """Install edge-tts if not available."""
-    print("edge-tts not found. Installing...")
+async def synthesize_parts(parts, output_file, voice=DEFAULT_VOICE, connector=None):
+    """Synthesize text parts concurrently and join them into output_file."""
+    part_files = [Path(f"{output_file}.part{i}") for i in range(len(parts))]
+
+    def join_parts():
+        with open(output_file, 'wb') as out:
+            for part_file in part_files:
+                append_file(out, part_file)
+
     try:
-        subprocess.run([sys.executable, "-m", "pip", "install", "edge-tts"], check=True)
-        print("✓ edge-tts installed successfully")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"Error installing edge-tts: {e}")
-        return False
+        await asyncio.gather(*(
+            asyncio.wait_for(stream_to_file(part, part_file, voice, connector), timeout=300)
+            for part, part_file in zip(parts, part_files)
+        ))
+        await asyncio.to_thread(join_parts)
+    finally:
+        for part_file in part_files:
+            part_file.unlink(missing_ok=True)
+
 
+async def convert_ssml_to_audio(ssml_file, output_file, voice=DEFAULT_VOICE, connector=None, ssml_bytes=None):
+    """Convert SSML file to audio using edge-tts.
 
-def convert_ssml_to_audio(ssml_file, output_file, voice=DEFAULT_VOICE):
-    """Convert SSML file to audio using edge-tts."""
+    Pass ssml_bytes if the file has already been read.
+    """
     print(f"Converting {ssml_file.name} to audio...")
 
     try:
-        # edge-tts doesn't directly support SSML files, so we need to read content
-        with open(ssml_file, 'r', encoding='utf-8') as f:
-            ssml_content = f.read()
+        # Read SSML content on a worker thread, keeping the event loop free
+        if ssml_bytes is None:
+            ssml_bytes = await asyncio.to_thread(ssml_file.read_bytes)
+        ssml_content = ssml_bytes.decode('utf-8')
 
-        # edge-tts command
-        cmd = [
-            "edge-tts",
-            "--voice", voice,
-            "--text", ssml_content,
-            "--write-media", str(output_file)
-        ]
+        text = strip_ssml_tags(ssml_content)
 
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        if not text:
+            print(f"Warning: No text content found in {ssml_file.name}")
+            return False
 
-        if result.returncode == 0:
-            print(f"✓ Audio saved to: {output_file}")
-            return True
+        parts = split_ssml_text(ssml_content) if len(text) > SPLIT_CHARS else [text]
+        if len(parts) > 1:
+            print(f"Splitting {ssml_file.name} into {len(parts)} parts")
+            await synthesize_parts(parts, output_file, voice, connector)
         else:
-            print(f"Error: {result.stderr}")
-            return False
+            await asyncio.wait_for(stream_to_file(text, output_file, voice, connector), timeout=300)
 
-    except subprocess.TimeoutExpired:
+        return True
+
+    except asyncio.TimeoutError:
         print(f"Timeout converting {ssml_file.name}")
         return False
     except Exception as e:
@@ -75,19 +190,183 @@ def convert_ssml_to_audio(ssml_file, output_file, voice=DEFAULT_VOICE):
         return False
 
 
+def audio_cache_key(ssml_bytes, voice):
+    """Cache key for synthesized audio; the voice is part of the key.
+
+    ssml_bytes may be any buffer, such as an mmap of the file.
+    """
+    # 128-bit BLAKE2b is plenty for a cache key and faster than SHA-256; the
+    # voice goes in as the hash key (hashed down if over the 64-byte limit)
+    voice_key = voice.encode('utf-8')
+    if len(voice_key) > hashlib.blake2b.MAX_KEY_SIZE:
+        voice_key = hashlib.blake2b(voice_key).digest()
+    return hashlib.blake2b(ssml_bytes, digest_size=16, key=voice_key).hexdigest()
+
+
+def hash_ssml_file(ssml_file, voice):
+    """Return (cache key, SSML bytes) for a file.
+
+    Large files are hashed straight from an mmap of the page cache instead of
+    being copied into a bytes object; their bytes are returned as None and
+    read again only if they need synthesizing.
+    """
+    with open(ssml_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_HASH_THRESHOLD:
+            ssml_bytes = f.read()
+            return audio_cache_key(ssml_bytes, voice), ssml_bytes
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return audio_cache_key(mm, voice), None
+
+
+def link_or_copy(src, dst):
+    """Put src at dst as a hard link (a copy across filesystems), replacing dst."""
+    # Already linked; renaming one link over another to the same file is a no-op
+    if dst.exists() and os.path.samefile(src, dst):
+        return
+
+    tmp = dst.with_suffix(dst.suffix + '.tmp')
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _normalize_mp3(path):
+    """Loudness-normalize an MP3 in place with ffmpeg.
+
+    CPU-bound, so it runs in a worker process rather than on the event loop.
+    """
+    tmp = f"{path}.norm"
+    cmd = ["ffmpeg", "-v", "error", "-y", "-i", str(path), "-af", LOUDNORM_FILTER,
+           *EDGE_TTS_AUDIO_ARGS, "-f", "mp3", tmp]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise RuntimeError(result.stderr.strip())
+    os.replace(tmp, path)
+
+
+async def convert_all(tasks, voice=DEFAULT_VOICE, concurrency=DEFAULT_CONCURRENCY, normalize=False, force=False):
+    """Convert (ssml_file, audio_file) pairs concurrently.
+
+    Audio already in the cache is linked into place without calling the TTS
+    service unless force is set. With normalize, each new track is
+    loudness-normalized in a process pool while synthesis of the others
+    continues. Returns a success flag per task, in task order.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Hash every file first, so identical SSML (shared intros, outros, ...)
+    # within the batch is synthesized once and linked to each destination.
+    # Blocking disk work runs on worker threads to keep the event loop free
+    hashed = await asyncio.gather(*(asyncio.to_thread(hash_ssml_file, ssml_file, voice) for ssml_file, _ in tasks))
+
+    by_hash = {}
+    for i, (key, _) in enumerate(hashed):
+        by_hash.setdefault(key, []).append(i)
+    if len(by_hash) < len(tasks):
+        print(f"{len(tasks) - len(by_hash)} duplicate SSML files will share audio")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = SharedConnector(limit=concurrency, ttl_dns_cache=300)
+    loop = asyncio.get_running_loop()
+    pool = ProcessPoolExecutor(max_workers=os.cpu_count()) if normalize else None
+
+    async def convert_one(key, indexes):
+        ssml_file = tasks[indexes[0]][0]
+        ssml_bytes = hashed[indexes[0]][1]
+        cached_file = CACHE_DIR / (f"{key}-loudnorm.mp3" if normalize else f"{key}.mp3")
+
+        if force or not cached_file.exists():
+            # Synthesize into the cache under a unique temp name, then publish
+            tmp_file = CACHE_DIR / f"{cached_file.stem}.{uuid.uuid4().hex}.tmp"
+            async with semaphore:
+                ok = await convert_ssml_to_audio(ssml_file, tmp_file, voice, connector, ssml_bytes)
+
+            # Post-process outside the semaphore so the next synthesis can start
+            if ok and pool is not None:
+                try:
+                    await loop.run_in_executor(pool, _normalize_mp3, tmp_file)
+                except Exception as e:
+                    print(f"Error normalizing {ssml_file.name}: {e}")
+                    ok = False
+
+            if not ok:
+                tmp_file.unlink(missing_ok=True)
+                return False
+            os.replace(tmp_file, cached_file)
+        else:
+            print(f"✓ Cached audio for: {ssml_file.name}")
+
+        for i in indexes:
+            await asyncio.to_thread(link_or_copy, cached_file, tasks[i][1])
+            print(f"✓ Audio saved to: {tasks[i][1]}")
+        return True
+
+    try:
+        outcomes = await asyncio.gather(*(convert_one(key, indexes) for key, indexes in by_hash.items()))
+
+        results = [False] * len(tasks)
+        for indexes, ok in zip(by_hash.values(), outcomes):
+            for i in indexes:
+                results[i] = ok
+        return results
+    finally:
+        await connector.shutdown()
+        if pool is not None:
+            pool.shutdown()
+
+
+def append_file(dst, src_path):
+    """Append the contents of src_path to the open binary file dst."""
+    with open(src_path, 'rb') as src:
+        if hasattr(os, 'sendfile'):
+            # Zero-copy: the kernel moves the bytes without a userspace buffer
+            size = os.fstat(src.fileno()).st_size
+            offset = 0
+            dst.flush()
+            try:
+                while offset < size:
+                    sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return
+            except OSError:
+                # Some filesystems refuse sendfile; copy the rest in userspace
+                src.seek(offset)
+        shutil.copyfileobj(src, dst, length=1 << 20)
+
+
 def concatenate_audio_files(audio_files, output_file):
     """Concatenate multiple audio files into a single podcast episode."""
     print(f"\nConcatenating {len(audio_files)} audio files...")
 
-    # Create a temporary file list for ffmpeg
-    file_list_path = OUTPUT_DIR / "concat_list.txt"
+    # edge-tts emits bare MP3 frames at a single fixed bitrate, so tracks from
+    # one voice can simply be appended byte for byte without re-muxing
+    if output_file.suffix == '.mp3' and all(f.suffix == '.mp3' for f in audio_files):
+        try:
+            with open(output_file, 'wb') as out:
+                for audio_file in audio_files:
+                    append_file(out, audio_file)
+            print(f"✓ Podcast saved to: {output_file}")
+            return True
+        except OSError as e:
+            print(f"Direct MP3 concatenation failed ({e}), falling back to ffmpeg")
+
+    # Write the file list for ffmpeg to a private temp file, so concurrent runs
+    # don't share one list in OUTPUT_DIR. FFmpeg concat needs absolute paths;
+    # resolve against the cwd once and write the whole list in a single call
+    cwd = os.getcwd()
+    payload = "\n".join(f"file '{os.path.join(cwd, audio_file)}'" for audio_file in audio_files) + "\n"
+    with tempfile.NamedTemporaryFile('wb', suffix='.txt', delete=False) as f:
+        f.write(payload.encode('utf-8'))
+    file_list_path = Path(f.name)
 
     try:
-        with open(file_list_path, 'w', encoding='utf-8') as f:
-            for audio_file in audio_files:
-                # FFmpeg concat requires relative or absolute paths in specific format
-                f.write(f"file '{audio_file.absolute()}'\n")
-
         # Use ffmpeg to concatenate
         cmd = [
             "ffmpeg",
@@ -117,7 +396,36 @@ def concatenate_audio_files(audio_files, output_file):
             file_list_path.unlink()
 
 
-def process_ssml_directory(voice=DEFAULT_VOICE, concatenate=True):
+def dump_manifest(manifest, path):
+    """Atomically write a manifest as indented JSON, using orjson when installed."""
+    if orjson is not None:
+        data = orjson.dumps(manifest, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(manifest, indent=2).encode('utf-8')
+
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def walk_ssml(root):
+    """Yield (path, path relative to root) for every .ssml file under root."""
+    # os.scandir gets each entry's type from the directory read itself, so the
+    # walk costs no extra stat() per file
+    pending = [root]
+    while pending:
+        current = pending.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                elif entry.name.endswith('.ssml') and entry.is_file():
+                    path = Path(entry.path)
+                    yield path, path.relative_to(root)
+
+
+def process_ssml_directory(voice=DEFAULT_VOICE, concatenate=True, concurrency=DEFAULT_CONCURRENCY, force=False,
+                           normalize=False):
     """Process all SSML files in the directory."""
     # Create output directory
     OUTPUT_DIR.mkdir(exist_ok=True)
@@ -132,7 +440,7 @@ def process_ssml_directory(voice=DEFAULT_VOICE, concatenate=True):
         manifest = json.load(f)
 
     # Get all SSML files
-    ssml_files = sorted(SSML_DIR.rglob("*.ssml"))
+    ssml_files = sorted(walk_ssml(SSML_DIR))
 
     if not ssml_files:
         print("Error: No SSML files found. Run convert-to-ssml.py first.")
@@ -140,32 +448,33 @@ def process_ssml_directory(voice=DEFAULT_VOICE, concatenate=True):
 
     print(f"Found {len(ssml_files)} SSML files to process")
 
+    # One timestamp for the whole run: the manifest and the podcast file name
+    # agree even if the run crosses midnight
+    now = datetime.now()
+
     # Create podcast manifest
     podcast_manifest = {
-        "generated_at": datetime.now().isoformat(),
+        "generated_at": now.isoformat(),
         "voice": voice,
         "total_files": len(ssml_files),
         "files": []
     }
 
-    audio_files = []
-
-    for i, ssml_file in enumerate(ssml_files, 1):
-        # Get relative path for organizing output
-        rel_path = ssml_file.relative_to(SSML_DIR)
+    # Create every output subdirectory once, rather than once per file
+    for rel_dir in {rel_path.parent for _, rel_path in ssml_files}:
+        (OUTPUT_DIR / rel_dir).mkdir(parents=True, exist_ok=True)
 
-        # Create corresponding output directory structure
-        output_subdir = OUTPUT_DIR / rel_path.parent
-        output_subdir.mkdir(parents=True, exist_ok=True)
+    # Unchanged files are not re-synthesized: convert_all finds their audio in
+    # the cache, whose key covers the SSML, the voice and normalization
+    tasks = [(ssml_file, OUTPUT_DIR / rel_path.parent / f"{ssml_file.stem}.mp3")
+             for ssml_file, rel_path in ssml_files]
 
-        # Output audio file path
-        audio_file = output_subdir / f"{ssml_file.stem}.mp3"
+    # Convert to audio
+    results = asyncio.run(convert_all(tasks, voice, concurrency, normalize, force))
 
-        print(f"\n[{i}/{len(ssml_files)}] Processing: {rel_path}")
-
-        # Convert to audio
-        success = convert_ssml_to_audio(ssml_file, audio_file, voice)
+    audio_files = []
 
+    for (ssml_file, audio_file), (_, rel_path), success in zip(tasks, ssml_files, results):
         if success:
             audio_files.append(audio_file)
             podcast_manifest["files"].append({
@@ -179,21 +488,16 @@ def process_ssml_directory(voice=DEFAULT_VOICE, concatenate=True):
                 "status": "failed"
             })
 
-    # Save individual files manifest
-    individual_manifest_file = OUTPUT_DIR / "individual-files-manifest.json"
-    with open(individual_manifest_file, 'w', encoding='utf-8') as f:
-        json.dump(podcast_manifest, f, indent=2)
-
     print(f"\n✓ Individual audio files generated!")
-    print(f"✓ Manifest saved to: {individual_manifest_file}")
 
     # Optionally concatenate all audio files into a single podcast
+    podcast_manifest["full_podcast"] = None
     if concatenate and audio_files:
         print("\n" + "=" * 60)
         print("Concatenating audio files into full podcast...")
         print("=" * 60)
 
-        full_podcast_file = OUTPUT_DIR / f"stt-finetune-podcast-{datetime.now().strftime('%Y%m%d')}.mp3"
+        full_podcast_file = OUTPUT_DIR / f"stt-finetune-podcast-{now.strftime('%Y%m%d')}.mp3"
         if concatenate_audio_files(audio_files, full_podcast_file):
             # Get file size and duration
             file_size_mb = full_podcast_file.stat().st_size / (1024 * 1024)
@@ -205,25 +509,76 @@ def process_ssml_directory(voice=DEFAULT_VOICE, concatenate=True):
                 "track_count": len(audio_files)
             }
 
-            # Save final manifest
-            final_manifest_file = OUTPUT_DIR / "podcast-manifest.json"
-            with open(final_manifest_file, 'w', encoding='utf-8') as f:
-                json.dump(podcast_manifest, f, indent=2)
-
             print(f"\n✓ Full podcast created!")
             print(f"  File: {full_podcast_file}")
             print(f"  Size: {file_size_mb:.2f} MB")
             print(f"  Tracks: {len(audio_files)}")
 
+    # Save the manifest once, whether or not a full podcast was built
+    podcast_manifest_file = OUTPUT_DIR / "podcast-manifest.json"
+    dump_manifest(podcast_manifest, podcast_manifest_file)
+    print(f"✓ Manifest saved to: {podcast_manifest_file}")
+
+
+def _tool_ok(name):
+    """Check that an external tool runs, caching a success for USER_CACHE_TTL.
+
+    Saves spawning the tool on every run when the script is invoked often.
+    Failures are not cached, so a freshly installed tool is seen right away.
+    """
+    cache_file = USER_CACHE_DIR / "tools.json"
+    try:
+        tools = json.loads(cache_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        tools = {}
+
+    entry = tools.get(name)
+    if entry and entry["ok"] and time.time() - entry["checked_at"] < USER_CACHE_TTL:
+        return True
+
+    try:
+        subprocess.run([name, "-version"], capture_output=True, check=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+    tools[name] = {"ok": True, "checked_at": time.time()}
+    try:
+        USER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        dump_manifest(tools, cache_file)
+    except OSError:
+        pass  # The cache is only an optimization
+    return True
+
+
+async def fetch_voices():
+    """Return the edge-tts voice catalog, cached for USER_CACHE_TTL."""
+    cache_file = USER_CACHE_DIR / "voices.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime < USER_CACHE_TTL:
+            return json.loads(cache_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        pass
+
+    voices = await edge_tts.list_voices()
+    try:
+        USER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        dump_manifest(voices, cache_file)
+    except OSError:
+        pass  # The cache is only an optimization
+    return voices
+
 
 def list_available_voices():
     """List available voices from edge-tts."""
     print("Fetching available voices...")
     try:
-        result = subprocess.run(["edge-tts", "--list-voices"], capture_output=True, text=True, check=True)
-        print(result.stdout)
-    except subprocess.CalledProcessError as e:
+        voices = asyncio.run(fetch_voices())
+    except Exception as e:
         print(f"Error listing voices: {e}")
+        return
+
+    for v in sorted(voices, key=lambda v: v["ShortName"]):
+        print(f"{v['ShortName']:<40} {v['Gender']:<8} {v['Locale']}")
 
 
 def main():
@@ -234,6 +589,10 @@ def main():
     parser.add_argument("--voice", default=DEFAULT_VOICE, help="TTS voice to use")
     parser.add_argument("--list-voices", action="store_true", help="List available voices")
     parser.add_argument("--no-concatenate", action="store_true", help="Don't concatenate into single file")
+    parser.add_argument("--force", action="store_true", help="Regenerate audio even if it is cached")
+    parser.add_argument("--normalize", action="store_true", help="Loudness-normalize each track with ffmpeg")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Number of files to synthesize at once (default: {DEFAULT_CONCURRENCY})")
 
     args = parser.parse_args()
 
@@ -246,23 +605,18 @@ def main():
         list_available_voices()
         return
 
-    # Check if edge-tts is installed
-    if not check_edge_tts():
-        if not install_edge_tts():
-            print("\nAlternatively, you can install it manually:")
-            print("  pip install edge-tts")
-            sys.exit(1)
-
     # Check if ffmpeg is available for concatenation
-    try:
-        subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("Warning: ffmpeg not found. Audio concatenation will not be available.")
-        print("Install ffmpeg to enable full podcast generation:")
+    if not _tool_ok("ffmpeg"):
+        # MP3 tracks are joined directly; ffmpeg is only the fallback
+        print("Warning: ffmpeg not found. Falling back to direct MP3 concatenation only.")
+        print("Install ffmpeg for the fallback concatenation path:")
         print("  sudo apt install ffmpeg")
-        args.no_concatenate = True
+        if args.normalize:
+            print("Error: --normalize requires ffmpeg")
+            sys.exit(1)
 
-    process_ssml_directory(voice=args.voice, concatenate=not args.no_concatenate)
+    process_ssml_directory(voice=args.voice, concatenate=not args.no_concatenate, concurrency=args.concurrency,
+                           force=args.force, normalize=args.normalize)
 
 
 if __name__ == "__main__":
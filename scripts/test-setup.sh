@@ -69,6 +69,7 @@ check_python_package() {
 
 check_python_package "requests"
 check_python_package "edge_tts"
+check_python_package "aiofiles"
 
 # Check ffmpeg
 echo ""